@@ -2,35 +2,354 @@ import os
 import time
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
+import re
+try:
+    # Optional google-re2: DFA matching, one linear pass for the whole keyword set
+    import re2 as _kw_re
+except ImportError:
+    import re as _kw_re
 import logging
+import logging.handlers
+import queue
+import atexit
 import random
+import hashlib
+import itertools
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta, UTC
 import google.generativeai as genai
+from websockets.sync.client import connect as websocket_connect
+from websockets.exceptions import WebSocketException
+from google.api_core import exceptions as google_exceptions
 import signal
 import sys
 from typing import Optional, Dict, List, Any
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bsky_bot.log'),
-        logging.StreamHandler()
-    ]
+# Session-level headers to drop for third-party APIs (keeps the Bluesky JWT off NewsAPI)
+NO_AUTH = {'Authorization': None}
+
+# Persisted Bluesky session so restarts can skip createSession
+SESSION_DIR = os.path.expanduser('~/.bsky_bot')
+SESSION_FILE = os.path.join(SESSION_DIR, 'session.json')
+# Error codes Bluesky uses (with HTTP 400 or 401) when a JWT is expired or revoked
+TOKEN_ERRORS = frozenset({"ExpiredToken", "InvalidToken"})
+ACCESS_TOKEN_TTL = 2 * 60 * 60  # AT Proto access JWTs are valid for ~2 hours
+TOKEN_EXPIRY_MARGIN = 5 * 60
+
+THREAD_CACHE_SIZE = 1024
+# (connect, read) seconds for every HTTP call, so a hung socket surfaces as an error
+HTTP_TIMEOUT = (5, 30)
+
+# Scheduler intervals, in seconds
+NEWS_POST_INTERVAL = 1800
+PERIODIC_POST_INTERVAL = 1800
+NOTIFICATION_POLL_INTERVAL = 60
+
+# Jetstream pushes new posts as JSON; replies/mentions of the bot are picked out locally
+JETSTREAM_URL = "wss://jetstream2.us-east.bsky.network/subscribe?wantedCollections=app.bsky.feed.post"
+JETSTREAM_MAX_BACKOFF = 60
+NEWS_CACHE_TTL = 15 * 60
+TOPICS_PER_QUERY = 3
+PROCESSED_NOTIFICATIONS_LIMIT = 5000
+REPLY_REASONS = frozenset({"reply", "mention"})
+NOTIFICATION_PAGE_SIZE = 50
+NOTIFICATION_MAX_PAGES = 20  # catch-up bound after a long outage
+
+# Local state that must survive restarts (answered notifications, poll cursor)
+STATE_DB = 'bsky_state.db'
+RECENT_ARTICLES_LIMIT = 500  # article hashes (URL and title) kept for dedup
+LLM_CACHE_SIZE = 512
+LLM_CACHE_TTL = 24 * 60 * 60
+
+# Phrases that mark a message as a request for news, matched in a single pass
+NEWS_REQUEST_RE = _kw_re.compile(
+    r"(?i)latest news|recent news|news about|what's new|what is new|updates on|tell me about|news on|heard about"
 )
+MENTION_RE = re.compile(r'@\S+')
+# Apostrophes stay inside a word so "what's" and "OpenAI's" aren't split apart
+TOPIC_WORD_RE = re.compile(r"\w[\w'+#.-]*")
+# Trailing punctuation and a possessive/contraction 's ("what's" -> "what")
+TOPIC_SUFFIX_RE = re.compile(r"(?:'s)?[.'-]*$", re.IGNORECASE)
+NEWS_TOPIC_STOPWORDS = frozenset({
+    'a', 'about', 'an', 'and', 'any', 'anything', 'are', 'at', 'be', 'for', 'from', 'going', 'happening',
+    'has', 'have', 'in', 'is', 'it', 'lately', 'me', 'new', 'of', 'on', 'or', 'please', 'regarding',
+    'some', 'that', 'the', 'there', 'this', 'to', 'today', 'what', 'whats', 'with', 'you'
+})
+
+# Static fields shared by every post record
+POST_TEMPLATE = {"$type": "app.bsky.feed.post", "langs": ["en"]}
+RECORD_TEMPLATE = {"collection": "app.bsky.feed.post"}
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+GEMINI_MODEL = 'gemini-1.5-flash'
+GEMINI_RPM_PER_KEY = 15
+GEMINI_KEY_COOLDOWN = 60
+
+# Static prompt instructions, sent once per model as the system instruction
+POST_INSTRUCTIONS = """
+Create a natural, conversational post about the AI news you are given.
+
+Requirements:
+- Write like a real person sharing interesting news
+- Include your perspective or a thought-provoking question
+- No promotional language or marketing speak
+- Keep it under 250 characters
+- Optional: one relevant emoji if it fits naturally
+- Sound genuine and interested in discussion
+"""
+
+REPLY_INSTRUCTIONS = """
+Generate a friendly and engaging reply to the user's message about AI.
+
+Requirements:
+- Be conversational and natural
+- Add value to the discussion
+- Ask a relevant follow-up question if appropriate
+- Keep it under 250 characters
+- Be friendly but professional
+"""
+
+# System instruction for each kind of Gemini call
+MODEL_INSTRUCTIONS = {
+    'post': POST_INSTRUCTIONS,
+    'reply': REPLY_INSTRUCTIONS
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace calls to an external API."""
+
+    def __init__(self, rate_per_sec: float, burst: int, stop_event: Optional[threading.Event] = None):
+        self.rate = rate_per_sec
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+        # Waiters give up once this is set, so a stopping bot isn't held up by pacing
+        self._stop_event = stop_event or threading.Event()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting up to `timeout` seconds (forever if None).
+
+        Returns False if the timeout passes or the stop event is set first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            if self._stop_event.wait(wait):
+                return False
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back all callers, e.g. after the upstream answered 429."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an upstream that keeps failing."""
+
+
+class CircuitBreaker:
+    """Stop calling an upstream for a while after repeated failures."""
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs) -> requests.Response:
+        """Run an HTTP call, counting exceptions and 5xx responses as failures."""
+        with self._lock:
+            if self.failures >= self.fail_max:
+                now = time.monotonic()
+                if now - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"{self.name} circuit open after {self.failures} failures")
+                # Half-open: let this caller probe and keep everyone else out until it reports back
+                self.opened_at = now
+        try:
+            response = func(*args, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record(False)
+            raise
+        self._record(response.status_code < 500)
+        return response
+
+    def _record(self, success: bool) -> None:
+        with self._lock:
+            if success:
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                # (Re)open; once reset_timeout passes a single call goes through as a probe
+                self.opened_at = time.monotonic()
+
+
+class WriteSafeRetry(Retry):
+    """Retry policy that never replays a POST the server may already have acted on.
+
+    POSTs are left out of allowed_methods, so read errors and 5xx responses are not
+    retried for them (createRecord would otherwise post twice). Connection errors are
+    retried for every method, and a POST that got 429 was refused before doing anything.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == 'POST':
+            return status_code == 429
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def retry_after_seconds(response: requests.Response, default: float = 60.0) -> float:
+    """Parse a Retry-After header given in seconds."""
+    try:
+        return float(response.headers.get('Retry-After', default))
+    except (TypeError, ValueError):
+        return default
+
+def require_env(name: str) -> str:
+    """Read a required setting from the environment."""
+    value = os.environ.get(name, '').strip()
+    if not value:
+        raise RuntimeError(f"Missing required environment variable {name}")
+    return value
+
+
+def gemini_keys_from_env() -> List[str]:
+    """Read GEMINI_API_KEYS (comma separated), falling back to GEMINI_API_KEY."""
+    raw = os.environ.get('GEMINI_API_KEYS') or require_env('GEMINI_API_KEY')
+    keys = [key.strip() for key in raw.split(',') if key.strip()]
+    if not keys:
+        raise RuntimeError("GEMINI_API_KEYS does not contain any keys")
+    return keys
+
+def article_hashes(article: Dict) -> List[str]:
+    """Identities for a news article: its URL, and its title so syndicated copies match too."""
+    hashes = []
+    if article.get('url'):
+        hashes.append(hashlib.sha1(article['url'].encode()).hexdigest())
+    # NewsAPI titles usually end in " - <Source>"; drop it so reprints of a story collide
+    title = ' '.join(re.findall(r'\w+', (article.get('title') or '').rsplit(' - ', 1)[0].lower()))
+    if title:
+        hashes.append(hashlib.sha1(f"title:{title}".encode()).hexdigest())
+    return hashes
+
+def is_usable_article(article: Dict) -> bool:
+    """False for NewsAPI rows with no link or title, and its "[Removed]" placeholders."""
+    return bool(article.get('url') and article.get('title')) and article['title'] != '[Removed]'
+
+def load_json(response: requests.Response) -> Any:
+    """Decode a response body with orjson, raising a RequestException on bad JSON."""
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+
+def iso_z(moment: Optional[datetime] = None) -> str:
+    """Format a UTC datetime as an AT Proto timestamp (microseconds, Z suffix)."""
+    moment = moment or datetime.now(UTC)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond:06d}Z'
+
+def parse_iso_z(value: str) -> datetime:
+    """Parse an AT Proto timestamp into an aware UTC datetime."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Configure logging: callers only enqueue records, a background listener does the I/O
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('bsky_bot.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger = logging.getLogger(__name__)
 
 class BskyAINewsBot:
-    def __init__(self, handle: str, app_password: str):
+    def __init__(self, handle: str, app_password: str, news_api_key: str, gemini_api_keys: List[str]):
         self.handle = handle
         self.app_password = app_password
         self.access_token = None
+        self.refresh_token = None
+        self.token_issued_at = 0.0
         self.did = None
+        self._auth_lock = threading.Lock()
         self.base_url = "https://bsky.social/xrpc"
         self.running = True
+        self._stop_event = threading.Event()
+        self._jetstream_connected = threading.Event()
+        # Worker threads post their name here when they exit, so start() can restart them
+        self._restart_queue: queue.Queue = queue.Queue()
+        self._workers: Dict[str, threading.Thread] = {}
+        self._notifications_caught_up = False
+        self._jetstream_cursor: Optional[int] = None
+        # One long-lived pool for fan-out work instead of spawning threads every cycle
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='bsky-io')
         self.last_article = None
+        self._news_cache: Optional[tuple] = None  # (fetched_at, articles)
+        self._recent_article_hashes = deque()
+        self._recent_article_set = set()
         self.last_checked_notification = datetime.now(UTC)
+        # Set for O(1) membership, deque to evict the oldest URIs in lockstep
+        self.processed_notifications = set()
+        self._processed_order = deque()
+        # URIs a worker is currently answering; Jetstream and polling can deliver the same post
+        self._in_flight_notifications = set()
+        self._processed_lock = threading.Lock()
+        self._init_state_db()
+
+        # Exact-match Gemini response cache (hot entries; the full cache lives in STATE_DB)
+        self._llm_cache: OrderedDict = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+
+        # Post records are immutable, so a thread fetched once can be reused
+        self._thread_cache: OrderedDict = OrderedDict()
+        self._thread_cache_lock = threading.Lock()
+
+        # Shared HTTP session so repeated calls reuse pooled keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=WriteSafeRetry(
+                total=5,
+                backoff_factor=0.5,
+                backoff_jitter=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': 'BskyAINewsBot/1.1'})
+        self._bsky_breaker = CircuitBreaker('bluesky')
+        self._newsapi_breaker = CircuitBreaker('newsapi')
         
         # Prompt templates for varied posts
         self.post_prompts = [
@@ -41,9 +360,25 @@ class BskyAINewsBot:
         ]
         
         # Configure APIs
-        self.news_api_key = '' # Add API key for NEWS API
-        genai.configure(api_key='') # Add API key for GEMINI
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.news_api_key = news_api_key
+
+        # Round-robin over Gemini keys so throughput scales past the per-key RPM cap
+        self._gemini_keys = list(gemini_api_keys)
+        self._key_iter = itertools.cycle(self._gemini_keys)
+        self._key_cooldown: Dict[str, float] = {}
+        self._gemini_key_lock = threading.Lock()
+        self._gemini_config_lock = threading.Lock()
+        self._gemini_models: Dict[tuple, genai.GenerativeModel] = {}
+        # The post, periodic and notification workers all call Gemini; cap how many run at once
+        self._gemini_sem = threading.Semaphore(2)
+
+        # Per-service rate limits: Gemini free tier ~15 RPM, NewsAPI 100/day, Bluesky writes
+        self._gemini_limiter = TokenBucket(GEMINI_RPM_PER_KEY * len(self._gemini_keys) / 60, 5, self._stop_event)
+        self._newsapi_limiter = TokenBucket(100 / 86400, 10, self._stop_event)
+        self._bsky_write_limiter = TokenBucket(10, 20, self._stop_event)
+        # Replies are paced as a group (20/min) rather than by sleeping after each one
+        self._reply_limiter = TokenBucket(20 / 60, 5, self._stop_event)
+        self._notification_sem = threading.Semaphore(5)
         
         # AI topics to track
         self.ai_topics = [
@@ -51,112 +386,334 @@ class BskyAINewsBot:
             'Anthropic', 'OpenAI', 'Microsoft', 'Google', 'xAI',
             'AI regulation', 'AI ethics', 'machine learning'
         ]
+        # Rotate through small topic groups so each NewsAPI query is short and on-topic
+        self._topic_queries = [
+            ' OR '.join(f'"{topic}"' for topic in self.ai_topics[i:i + TOPICS_PER_QUERY])
+            for i in range(0, len(self.ai_topics), TOPICS_PER_QUERY)
+        ]
+        self._topic_cursor = 0
+
+        # Reuse the previous run's session; start() only logs in if this finds nothing
+        self._load_session()
+
+    def _init_state_db(self) -> None:
+        """Open the state database and warm the in-memory caches from it."""
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(STATE_DB, check_same_thread=False)
+        with self._db_lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS processed(uri TEXT PRIMARY KEY, ts INTEGER)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS state(key TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS posted_articles(hash TEXT PRIMARY KEY, ts INTEGER)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache(key TEXT PRIMARY KEY, response TEXT, ts INTEGER)")
+            self._db.execute("DELETE FROM llm_cache WHERE ts < ?", (int(time.time()) - LLM_CACHE_TTL,))
+            rows = self._db.execute(
+                "SELECT uri FROM processed ORDER BY ts DESC LIMIT ?", (PROCESSED_NOTIFICATIONS_LIMIT,)
+            ).fetchall()
+            saved = self._db.execute(
+                "SELECT value FROM state WHERE key = 'last_checked_notification'"
+            ).fetchone()
+            article_rows = self._db.execute(
+                "SELECT hash FROM posted_articles ORDER BY ts DESC LIMIT ?", (RECENT_ARTICLES_LIMIT,)
+            ).fetchall()
+
+        for (uri,) in reversed(rows):
+            self.processed_notifications.add(uri)
+            self._processed_order.append(uri)
+        if saved:
+            self.last_checked_notification = datetime.fromisoformat(saved[0])
+        for (digest,) in reversed(article_rows):
+            self._recent_article_hashes.append(digest)
+            self._recent_article_set.add(digest)
+
+    def _remember_article(self, article: Dict) -> None:
+        """Record a posted article in memory and on disk."""
+        digests = [digest for digest in article_hashes(article) if digest not in self._recent_article_set]
+        for digest in digests:
+            self._recent_article_hashes.append(digest)
+            self._recent_article_set.add(digest)
+            if len(self._recent_article_hashes) > RECENT_ARTICLES_LIMIT:
+                self._recent_article_set.discard(self._recent_article_hashes.popleft())
+        now = int(time.time())
+        with self._db_lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO posted_articles(hash, ts) VALUES (?, ?)", [(digest, now) for digest in digests]
+            )
+
+    def _save_state(self, key: str, value: str) -> None:
+        with self._db_lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO state(key, value) VALUES (?, ?)", (key, value))
 
     def authenticate(self) -> None:
         """Authenticate with Bluesky."""
         try:
-            response = requests.post(
+            response = self._bsky_breaker.call(
+                self.session.post,
                 f"{self.base_url}/com.atproto.server.createSession",
-                json={"identifier": self.handle, "password": self.app_password}
+                headers=NO_AUTH,
+                json={"identifier": self.handle, "password": self.app_password},
+                timeout=HTTP_TIMEOUT
             )
             response.raise_for_status()
-            data = response.json()
-            self.access_token = data["accessJwt"]
-            self.did = data["did"]
-            logging.info("Authenticated with Bluesky")
-        except Exception as e:
-            logging.error(f"Authentication failed: {str(e)}")
+            self._store_tokens(load_json(response))
+            logger.info("Authenticated with Bluesky")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Authentication failed: {str(e)}")
             raise
 
+    def _store_tokens(self, data: Dict, issued_at: Optional[float] = None) -> None:
+        """Apply session tokens to the HTTP session and persist them."""
+        self.access_token = data["accessJwt"]
+        self.refresh_token = data["refreshJwt"]
+        self.did = data["did"]
+        self.token_issued_at = issued_at if issued_at is not None else time.time()
+        self.session.headers['Authorization'] = f"Bearer {self.access_token}"
+        if issued_at is None:
+            self._save_session()
+
+    def _save_session(self) -> None:
+        """Atomically write the current tokens to SESSION_FILE."""
+        try:
+            os.makedirs(SESSION_DIR, mode=0o700, exist_ok=True)
+            tmp_path = f"{SESSION_FILE}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    "handle": self.handle,
+                    "did": self.did,
+                    "accessJwt": self.access_token,
+                    "refreshJwt": self.refresh_token,
+                    "issuedAt": self.token_issued_at
+                }, f)
+            os.replace(tmp_path, SESSION_FILE)
+        except OSError as e:
+            logger.warning(f"Could not persist session: {str(e)}")
+
+    def _load_session(self) -> bool:
+        """Restore tokens saved by a previous run for the same handle."""
+        try:
+            with open(SESSION_FILE) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("handle") != self.handle or not data.get("refreshJwt"):
+            return False
+        self._store_tokens(data, issued_at=data.get("issuedAt", 0.0))
+        logger.info("Restored saved Bluesky session")
+        return True
+
+    def _token_rejected(self, response: requests.Response) -> bool:
+        """True when Bluesky refused the JWT itself (401, or 400 ExpiredToken)."""
+        if response.status_code == 401:
+            return True
+        if response.status_code != 400:
+            return False
+        try:
+            return load_json(response).get("error") in TOKEN_ERRORS
+        except (requests.exceptions.RequestException, AttributeError):
+            return False
+
+    def _token_expired(self) -> bool:
+        return time.time() - self.token_issued_at > ACCESS_TOKEN_TTL - TOKEN_EXPIRY_MARGIN
+
+    def _refresh(self, stale_token: Optional[str] = None) -> None:
+        """Refresh the access token, falling back to a full login."""
+        with self._auth_lock:
+            # Another thread already refreshed while we were waiting
+            if stale_token is not None and self.access_token != stale_token:
+                return
+            if self.refresh_token:
+                response = self._bsky_breaker.call(
+                    self.session.post,
+                    f"{self.base_url}/com.atproto.server.refreshSession",
+                    headers={"Authorization": f"Bearer {self.refresh_token}"},
+                    timeout=HTTP_TIMEOUT
+                )
+                if not self._token_rejected(response):
+                    response.raise_for_status()
+                    self._store_tokens(load_json(response))
+                    logger.info("Refreshed Bluesky session")
+                    return
+                logger.warning("Refresh token rejected, logging in again")
+            self.authenticate()
+
+    def _ensure_session(self) -> None:
+        """Make sure a usable access token is loaded."""
+        if not self.access_token:
+            with self._auth_lock:
+                if not self.access_token:
+                    self.authenticate()
+        if self._token_expired():
+            self._refresh(self.access_token)
+
+    def _authed_request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Call an XRPC endpoint, refreshing and replaying once on an expired token."""
+        self._ensure_session()
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        token = self.access_token
+        response = self._bsky_breaker.call(self.session.request, method, f"{self.base_url}/{path}", **kwargs)
+        if self._token_rejected(response):
+            self._refresh(token)
+            response = self._bsky_breaker.call(self.session.request, method, f"{self.base_url}/{path}", **kwargs)
+        return response
+
     def create_post(self, text: str, reply_to: Optional[Dict] = None) -> Optional[str]:
         """Create a post or reply."""
         try:
-            if not self.access_token:
-                self.authenticate()
-
-            post_data = {
-                "$type": "app.bsky.feed.post",
-                "text": text,
-                "createdAt": datetime.now(UTC).isoformat().replace('+00:00', 'Z'),
-                "langs": ["en"]
-            }
+            post_data = {**POST_TEMPLATE, "text": text, "createdAt": iso_z()}
 
             # Add reply reference if this is a reply
             if reply_to:
-                post_data["reply"] = {
-                    "root": {
-                        "uri": reply_to["uri"],
-                        "cid": reply_to["cid"]
-                    },
-                    "parent": {
-                        "uri": reply_to["uri"],
-                        "cid": reply_to["cid"]
-                    }
-                }
+                ref = {"uri": reply_to["uri"], "cid": reply_to["cid"]}
+                post_data["reply"] = {"root": ref, "parent": ref}
 
-            response = requests.post(
-                f"{self.base_url}/com.atproto.repo.createRecord",
-                headers={"Authorization": f"Bearer {self.access_token}"},
-                json={
-                    "repo": self.did,
-                    "collection": "app.bsky.feed.post",
-                    "record": post_data
-                }
+            if not self._bsky_write_limiter.acquire():
+                return None  # shutting down
+            response = self._authed_request(
+                "POST",
+                "com.atproto.repo.createRecord",
+                # Shallow copy of the template: replies are created concurrently
+                data=orjson.dumps({**RECORD_TEMPLATE, "repo": self.did, "record": post_data}),
+                headers=JSON_HEADERS
             )
-            response.raise_for_status()
-            return response.json().get("uri")
-        except Exception as e:
-            logging.error(f"Post creation error: {str(e)}")
+            self._check_rate_limit(response, self._bsky_write_limiter)
+            return load_json(response).get("uri")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Post creation error: {str(e)}")
             return None
 
+    def _next_gemini_key(self) -> str:
+        """Pick the next Gemini key that is not cooling off after a 429."""
+        with self._gemini_key_lock:
+            now = time.monotonic()
+            for _ in range(len(self._gemini_keys)):
+                key = next(self._key_iter)
+                if self._key_cooldown.get(key, 0) <= now:
+                    return key
+            return min(self._gemini_keys, key=lambda k: self._key_cooldown.get(k, 0))
+
+    def _call_model(self, key: str, kind: str, prompt: str):
+        """Run a prompt on the model for (key, kind), creating it on first use."""
+        model = self._gemini_models.get((key, kind))
+        if model is None:
+            # genai.configure is global and a GenerativeModel binds the configured
+            # client on its first request, so configure and make that request together
+            with self._gemini_config_lock:
+                model = self._gemini_models.get((key, kind))
+                if model is None:
+                    genai.configure(api_key=key)
+                    model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=MODEL_INSTRUCTIONS[kind])
+                    response = model.generate_content(prompt)
+                    self._gemini_models[(key, kind)] = model
+                    return response
+        return model.generate_content(prompt)
+
+    def _generate_content(self, prompt: str, kind: str):
+        """Call Gemini while staying under its concurrent-request cap."""
+        if not self._gemini_limiter.acquire():
+            raise RuntimeError("Bot is stopping")
+        key = self._next_gemini_key()
+        with self._gemini_sem:
+            try:
+                return self._call_model(key, kind, prompt)
+            except google_exceptions.ResourceExhausted:
+                with self._gemini_key_lock:
+                    self._key_cooldown[key] = time.monotonic() + GEMINI_KEY_COOLDOWN
+                    all_cooling = all(self._key_cooldown.get(k, 0) > time.monotonic() for k in self._gemini_keys)
+                if all_cooling:
+                    self._gemini_limiter.block_for(GEMINI_KEY_COOLDOWN)
+                raise
+
+    def _cached_generate(self, prompt: str, kind: str) -> str:
+        """Return Gemini's text for a prompt, reusing earlier answers to the identical prompt."""
+        key = hashlib.sha1(f"{kind}\0{prompt}".encode()).hexdigest()
+        now = time.time()
+        with self._llm_cache_lock:
+            cached = self._llm_cache.get(key)
+            if cached and now - cached[0] < LLM_CACHE_TTL:
+                self._llm_cache.move_to_end(key)
+                return cached[1]
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT ts, response FROM llm_cache WHERE key = ? AND ts >= ?", (key, int(now) - LLM_CACHE_TTL)
+            ).fetchone()
+
+        if row:
+            entry = (row[0], row[1])
+        else:
+            text = self._generate_content(prompt, kind).text
+            entry = (now, text)
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache(key, response, ts) VALUES (?, ?, ?)", (key, text, int(now))
+                )
+
+        with self._llm_cache_lock:
+            self._llm_cache[key] = entry
+            if len(self._llm_cache) > LLM_CACHE_SIZE:
+                self._llm_cache.popitem(last=False)
+        return entry[1]
+
+    def _check_rate_limit(self, response: requests.Response, limiter: TokenBucket) -> None:
+        """Back the limiter off for Retry-After when the upstream returned 429."""
+        if response.status_code == 429:
+            limiter.block_for(retry_after_seconds(response))
+        response.raise_for_status()
+
     def fetch_ai_news(self) -> List[Dict]:
         """Fetch AI-related news."""
+        if self._news_cache and time.time() - self._news_cache[0] < NEWS_CACHE_TTL:
+            return self._news_cache[1]
         try:
-            query = ' OR '.join(f'"{topic}"' for topic in self.ai_topics)
-            
-            response = requests.get(
+            if not self._newsapi_limiter.acquire(timeout=30):
+                logger.warning("NewsAPI rate limit reached, skipping fetch")
+                return []
+
+            query = self._topic_queries[self._topic_cursor]
+            self._topic_cursor = (self._topic_cursor + 1) % len(self._topic_queries)
+
+            response = self._newsapi_breaker.call(
+                self.session.get,
                 'https://newsapi.org/v2/everything',
+                headers=NO_AUTH,
+                timeout=HTTP_TIMEOUT,
                 params={
                     'q': query,
+                    # Match topics only in the fields we'd have checked them in locally
+                    'searchIn': 'title,description',
                     'sortBy': 'publishedAt',
                     'language': 'en',
                     'apiKey': self.news_api_key,
-                    'pageSize': 100
+                    'pageSize': 5
                 }
             )
-            response.raise_for_status()
-            articles = response.json().get('articles', [])
-            
-            relevant_articles = [
-                article for article in articles
-                if any(topic.lower() in (article.get('title', '') + article.get('description', '')).lower()
-                      for topic in self.ai_topics)
-            ]
+            self._check_rate_limit(response, self._newsapi_limiter)
+            # NewsAPI still returns the odd placeholder or half-empty row; never post those
+            articles = [
+                article for article in load_json(response).get('articles', [])
+                if is_usable_article(article)
+            ][:5]
             
-            return relevant_articles[:5]
-        except Exception as e:
-            logging.error(f"News fetch error: {str(e)}")
+            self._news_cache = (time.time(), articles)
+            return articles
+        except requests.exceptions.RequestException as e:
+            logger.error(f"News fetch error: {str(e)}")
             return []
 
-    def generate_post(self, article: Dict) -> str:
+    def generate_post(self, article: Dict, use_cache: bool = True) -> str:
         """Generate conversational post content."""
         try:
-            prompt = f"""
-            Create a natural, conversational post about this AI news:
-            Title: {article.get('title', 'AI News')}
-            Description: {article.get('description', 'Exciting developments in AI')}
-
-            Requirements:
-            - Write like a real person sharing interesting news
-            - Include your perspective or a thought-provoking question
-            - No promotional language or marketing speak
-            - Keep it under 250 characters
-            - Optional: one relevant emoji if it fits naturally
-            - Sound genuine and interested in discussion
-            """
-
-            response = self.model.generate_content(prompt)
-            post = response.text[:250]
+            prompt = (
+                # NewsAPI sends null for missing fields, which .get(key, default) would keep
+                f"Title: {article.get('title') or 'AI News'}\n"
+                f"Description: {article.get('description') or 'Exciting developments in AI'}"
+            )
+
+            if use_cache:
+                text = self._cached_generate(prompt, 'post')
+            else:
+                text = self._generate_content(prompt, 'post').text
+            post = text[:250]
             
             source = article.get('source', {}).get('name', '')
             if source:
@@ -164,35 +721,65 @@ class BskyAINewsBot:
             
             return post[:280]
         except Exception as e:
-            logging.error(f"Post generation error: {str(e)}")
+            logger.error(f"Post generation error: {str(e)}")
             return f"Interesting AI development... what are your thoughts? (via {article.get('source', {}).get('name', 'Unknown Source')})"
 
-    def get_notifications(self) -> List[Dict]:
-        """Fetch recent notifications."""
+    def get_notifications(self, since: datetime) -> Optional[List[Dict]]:
+        """Fetch notifications indexed after `since`, or None if any page failed."""
+        notifications = []
+        # Let the server drop likes/follows/reposts instead of shipping them to us
+        params = {"limit": NOTIFICATION_PAGE_SIZE, "reasons": sorted(REPLY_REASONS)}
         try:
-            response = requests.get(
-                f"{self.base_url}/app.bsky.notification.listNotifications",
-                headers={"Authorization": f"Bearer {self.access_token}"},
-                params={"limit": 20}
+            for _ in range(NOTIFICATION_MAX_PAGES):
+                response = self._authed_request("GET", "app.bsky.notification.listNotifications", params=params)
+                response.raise_for_status()
+                data = load_json(response)
+                page = data.get("notifications", [])
+                notifications.extend(page)
+                # Pages are newest first, so stop at the first one reaching back to `since`
+                if not page or not data.get("cursor") or parse_iso_z(page[-1]["indexedAt"]) <= since:
+                    return notifications
+                params = {**params, "cursor": data["cursor"]}
+            logger.warning(f"Stopped notification catch-up after {NOTIFICATION_MAX_PAGES} pages")
+            return notifications
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            logger.error(f"Error fetching notifications: {str(e)}")
+            return None
+
+    def mark_notifications_seen(self, seen_at: datetime) -> None:
+        """Advance the server-side seen cursor."""
+        try:
+            response = self._authed_request(
+                "POST",
+                "app.bsky.notification.updateSeen",
+                json={"seenAt": iso_z(seen_at)}
             )
             response.raise_for_status()
-            return response.json().get("notifications", [])
-        except Exception as e:
-            logging.error(f"Error fetching notifications: {str(e)}")
-            return []
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error updating notification seen state: {str(e)}")
 
     def get_post_thread(self, uri: str, depth: int = 1) -> Optional[Dict]:
         """Fetch a post's thread context."""
+        key = (uri, depth)
+        with self._thread_cache_lock:
+            if key in self._thread_cache:
+                self._thread_cache.move_to_end(key)
+                return self._thread_cache[key]
         try:
-            response = requests.get(
-                f"{self.base_url}/app.bsky.feed.getPostThread",
-                headers={"Authorization": f"Bearer {self.access_token}"},
+            response = self._authed_request(
+                "GET",
+                "app.bsky.feed.getPostThread",
                 params={"uri": uri, "depth": depth}
             )
             response.raise_for_status()
-            return response.json().get("thread", {})
-        except Exception as e:
-            logging.error(f"Error fetching thread: {str(e)}")
+            thread = load_json(response).get("thread", {})
+            with self._thread_cache_lock:
+                self._thread_cache[key] = thread
+                if len(self._thread_cache) > THREAD_CACHE_SIZE:
+                    self._thread_cache.popitem(last=False)
+            return thread
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching thread: {str(e)}")
             return None
 
     def should_reply_to_notification(self, notification: Dict) -> bool:
@@ -202,11 +789,11 @@ class BskyAINewsBot:
             return False
         
         # Only reply to replies and mentions
-        if notification.get("reason") not in ["reply", "mention"]:
+        if notification.get("reason") not in REPLY_REASONS:
             return False
         
         # Check if the notification is new
-        notification_time = datetime.fromisoformat(notification.get("indexedAt").replace('Z', '+00:00'))
+        notification_time = parse_iso_z(notification.get("indexedAt"))
         if notification_time <= self.last_checked_notification:
             return False
         
@@ -215,8 +802,15 @@ class BskyAINewsBot:
     def fetch_specific_news(self, query: str) -> List[Dict]:
         """Fetch news for a specific query."""
         try:
-            response = requests.get(
+            if not self._newsapi_limiter.acquire(timeout=30):
+                logger.warning("NewsAPI rate limit reached, skipping fetch")
+                return []
+
+            response = self._newsapi_breaker.call(
+                self.session.get,
                 'https://newsapi.org/v2/everything',
+                headers=NO_AUTH,
+                timeout=HTTP_TIMEOUT,
                 params={
                     'q': query,
                     'sortBy': 'publishedAt',
@@ -225,40 +819,30 @@ class BskyAINewsBot:
                     'pageSize': 3
                 }
             )
-            response.raise_for_status()
-            articles = response.json().get('articles', [])
+            self._check_rate_limit(response, self._newsapi_limiter)
+            articles = [
+                article for article in load_json(response).get('articles', [])
+                if is_usable_article(article)
+            ]
             return articles[:3]
-        except Exception as e:
-            logging.error(f"Specific news fetch error: {str(e)}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Specific news fetch error: {str(e)}")
             return []
 
     def extract_news_request(self, text: str) -> Optional[str]:
         """Extract news request from user message."""
-        news_keywords = [
-            'latest news', 'recent news', 'news about', 
-            'what\'s new', 'what is new', 'updates on',
-            'tell me about', 'news on', 'heard about'
-        ]
-        
-        text_lower = text.lower()
-        
-        if any(keyword in text_lower for keyword in news_keywords):
-            try:
-                prompt = f"""
-                Extract the main topic or subject of this news request: {text}
-                Only return the key topic(s) without any additional words or punctuation.
-                For example:
-                Input: "What's the latest news about ChatGPT and OpenAI?"
-                Output: ChatGPT OpenAI
-                Input: "Tell me recent news about AI regulation in Europe"
-                Output: AI regulation Europe
-                """
-                
-                response = self.model.generate_content(prompt)
-                return response.text.strip()
-            except Exception as e:
-                logging.error(f"News request extraction error: {str(e)}")
-                return None
+        # Phones send typographic apostrophes ("what’s new")
+        text = MENTION_RE.sub(' ', text).replace('\u2019', "'")
+        match = NEWS_REQUEST_RE.search(text)
+        if not match:
+            return None
+
+        # The topic normally follows the phrase ("news about X"); otherwise it precedes it
+        for fragment in (text[match.end():], text[:match.start()]):
+            words = [TOPIC_SUFFIX_RE.sub('', word) for word in TOPIC_WORD_RE.findall(fragment)]
+            topics = [word for word in words if word and word.lower() not in NEWS_TOPIC_STOPWORDS]
+            if topics:
+                return ' '.join(topics[:6])
         return None
 
     def format_news_response(self, articles: List[Dict]) -> str:
@@ -287,164 +871,324 @@ class BskyAINewsBot:
         
         return response[:280]
 
-    def handle_notifications(self) -> None:
-        """Process and respond to notifications."""
+    def handle_notifications(self) -> bool:
+        """Process and respond to notifications.
+
+        Returns False if they could not be fetched; the poll cursor is then left where it was.
+        """
         try:
-            notifications = self.get_notifications()
-            for notification in notifications:
-                if self.should_reply_to_notification(notification):
-                    reply_text = self.generate_reply(notification)
-                    if reply_text:
-                        self.create_post(reply_text, reply_to=notification)
-                        time.sleep(2)  # Rate limiting
+            cycle_start = datetime.now(UTC)
+            fetched = self.get_notifications(self.last_checked_notification)
+            if fetched is None:
+                return False
+            notifications = [
+                notification for notification in fetched
+                if self.should_reply_to_notification(notification)
+                and not self._is_processed(notification.get("uri"))
+            ]
+            # Thread fetches are independent reads, so issue them all at once; generation
+            # and posting then run under the notification semaphore and rate limiters.
+            # A failed fetch becomes {} so _process_notification doesn't fetch it again.
+            threads = list(self._executor.map(
+                lambda notification: self.get_post_thread(notification.get("uri")) or {}, notifications
+            ))
+            list(self._executor.map(self._process_notification, notifications, threads))
             
-            self.last_checked_notification = datetime.now(UTC)
+            self.last_checked_notification = cycle_start
+            self._save_state('last_checked_notification', cycle_start.isoformat())
+            if notifications:
+                self.mark_notifications_seen(cycle_start)
+            return True
+        except Exception as e:
+            logger.error(f"Notification handling error: {str(e)}")
+            return False
+
+    def _process_notification(self, notification: Dict, thread: Optional[Dict] = None) -> None:
+        """Reply to a single notification unless it was already answered."""
+        uri = notification.get("uri")
+        if not self._claim_notification(uri):
+            return
+        try:
+            # Only Jetstream events get here without a thread; polled ones were prefetched
+            if thread is None:
+                thread = self.get_post_thread(uri)
+            with self._notification_sem:
+                reply_text = self.generate_reply(notification, thread)
+                # acquire() only fails once the bot is stopping
+                if reply_text and self._reply_limiter.acquire():
+                    if self.create_post(reply_text, reply_to=notification):
+                        self._mark_processed(uri)
         except Exception as e:
-            logging.error(f"Notification handling error: {str(e)}")
+            logger.error(f"Error processing notification {uri}: {str(e)}")
+        finally:
+            # Answered URIs are in the processed set by now; failed ones may be retried
+            with self._processed_lock:
+                self._in_flight_notifications.discard(uri)
+
+    def _claim_notification(self, uri: str) -> bool:
+        """Reserve an unanswered notification so only one worker replies to it."""
+        if self._is_processed(uri):
+            return False
+        with self._processed_lock:
+            # Re-check under the lock: another worker may have answered it since
+            if uri in self._in_flight_notifications or uri in self.processed_notifications:
+                return False
+            self._in_flight_notifications.add(uri)
+            return True
+
+    def _is_processed(self, uri: str) -> bool:
+        with self._processed_lock:
+            if uri in self.processed_notifications:
+                return True
+        # Fall back to disk for URIs evicted from the in-memory window
+        with self._db_lock:
+            return self._db.execute("SELECT 1 FROM processed WHERE uri = ?", (uri,)).fetchone() is not None
+
+    def _mark_processed(self, uri: str) -> None:
+        """Remember an answered notification, evicting the oldest past the limit."""
+        with self._processed_lock:
+            if uri in self.processed_notifications:
+                return
+            self.processed_notifications.add(uri)
+            self._processed_order.append(uri)
+            if len(self._processed_order) > PROCESSED_NOTIFICATIONS_LIMIT:
+                self.processed_notifications.discard(self._processed_order.popleft())
+        with self._db_lock, self._db:
+            self._db.execute("INSERT OR IGNORE INTO processed(uri, ts) VALUES (?, ?)", (uri, int(time.time())))
 
-    def generate_reply(self, notification: Dict) -> str:
-        """Generate a contextual reply."""
+    def generate_reply(self, notification: Dict, thread: Optional[Dict] = None) -> str:
+        """Generate a contextual reply from the notification and its thread, if one was fetched."""
         try:
-            thread = self.get_post_thread(notification.get("uri"))
-            if not thread:
+            # Jetstream events can arrive before the AppView has indexed the post, so
+            # fall back to the record carried on the notification itself
+            thread = thread or {}
+            record = thread.get("post", {}).get("record") or notification.get("record") or {}
+            user_message = record.get("text", "")
+            if not user_message:
                 return ""
 
-            user_message = thread.get("post", {}).get("record", {}).get("text", "")
-            user_handle = notification.get("author", {}).get("handle", "")
+            user_handle = (
+                notification.get("author", {}).get("handle")
+                or thread.get("post", {}).get("author", {}).get("handle", "")
+            )
             
             news_query = self.extract_news_request(user_message)
             if news_query:
                 articles = self.fetch_specific_news(news_query)
                 return self.format_news_response(articles)
             
-            prompt = f"""
-            Generate a friendly and engaging reply to this user's message about AI:
-            User (@{user_handle}): {user_message}
-
-            Requirements:
-            - Be conversational and natural
-            - Add value to the discussion
-            - Ask a relevant follow-up question if appropriate
-            - Keep it under 250 characters
-            - Be friendly but professional
-            """
-
-            response = self.model.generate_content(prompt)
-            return response.text[:250]
+            prompt = f"User (@{user_handle}): {user_message}"
+
+            return self._cached_generate(prompt, 'reply')[:250]
         except Exception as e:
-            logging.error(f"Reply generation error: {str(e)}")
+            logger.error(f"Reply generation error: {str(e)}")
             return "Thanks for your thoughts on AI! What's your take on recent developments in this space? 🤔"
 
     def post_news_update(self) -> None:
         """Post a single AI news update."""
         try:
-            articles = self.fetch_ai_news()
-            if articles:
-                post_text = self.generate_post(articles[0])
-                self.create_post(post_text)
-                time.sleep(2)  # Rate limiting
+            # Skip Gemini entirely when every fetched article was already posted
+            articles = [
+                article for article in self.fetch_ai_news()
+                if not any(digest in self._recent_article_set for digest in article_hashes(article))
+            ]
+            if not articles:
+                logger.info("No new articles to post")
+                return
+
+            article = articles[0]
+            post_text = self.generate_post(article)
+            if self.create_post(post_text):
+                self._remember_article(article)
+                self.last_article = article
         except Exception as e:
-            logging.error(f"News update error: {str(e)}")
+            logger.error(f"News update error: {str(e)}")
 
     def periodic_posting(self):
         """Post periodic AI-related updates."""
         try:
             prompt = random.choice(self.post_prompts)
-            ai_post = self.generate_post({"title": prompt, "description": prompt})
+            # Fresh generation each time; a cached answer would repeat the same post
+            ai_post = self.generate_post({"title": prompt, "description": prompt}, use_cache=False)
             self.create_post(ai_post)
         except Exception as e:
-            logging.error(f"Error in periodic posting: {str(e)}")
+            logger.error(f"Error in periodic posting: {str(e)}")
+
+    def stop(self) -> None:
+        """Signal all workers to stop and wake any that are waiting."""
+        self.running = False
+        self._stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._restart_queue.put(None)  # wake the supervisor
+
+    def _poll_notifications(self) -> None:
+        """Poll listNotifications to catch up at startup or while Jetstream is down."""
+        if self._notifications_caught_up and self._jetstream_connected.is_set():
+            return
+        # Stay in polling mode until a catch-up has actually succeeded
+        if self.handle_notifications():
+            self._notifications_caught_up = True
+
+    def _notification_from_event(self, event: Dict) -> Optional[Dict]:
+        """Turn a Jetstream post event aimed at the bot into a notification-shaped dict."""
+        commit = event.get("commit") or {}
+        if event.get("kind") != "commit" or commit.get("operation") != "create":
+            return None
+        author_did = event.get("did")
+        if not author_did or author_did == self.did:
+            return None
+
+        record = commit.get("record") or {}
+        parent_uri = record.get("reply", {}).get("parent", {}).get("uri", "")
+        if parent_uri.startswith(f"at://{self.did}/"):
+            reason = "reply"
+        elif any(
+            feature.get("did") == self.did
+            for facet in record.get("facets", [])
+            for feature in facet.get("features", [])
+        ):
+            reason = "mention"
+        else:
+            return None
+
+        return {
+            "uri": f"at://{author_did}/{commit.get('collection')}/{commit.get('rkey')}",
+            "cid": commit.get("cid"),
+            "author": {"did": author_did},
+            "reason": reason,
+            "record": record,
+            "indexedAt": iso_z(datetime.fromtimestamp(event.get("time_us", 0) / 1e6, UTC))
+        }
+
+    def _run_jetstream(self) -> None:
+        """Receive replies and mentions from Jetstream as they happen."""
+        backoff = 1
+        while self.running:
+            url = JETSTREAM_URL
+            if self._jetstream_cursor:
+                # Resume from the last event seen so a reconnect doesn't drop anything
+                url += f"&cursor={self._jetstream_cursor}"
+            try:
+                with websocket_connect(url, open_timeout=10, close_timeout=2) as websocket:
+                    self._jetstream_connected.set()
+                    logger.info("Connected to Jetstream")
+                    backoff = 1
+                    while self.running:
+                        try:
+                            message = websocket.recv(timeout=5)
+                        except TimeoutError:
+                            continue
+                        event = orjson.loads(message)
+                        self._jetstream_cursor = event.get("time_us", self._jetstream_cursor)
+                        notification = self._notification_from_event(event)
+                        if notification:
+                            self._executor.submit(self._process_notification, notification)
+            except (OSError, WebSocketException, ValueError) as e:
+                logger.warning(f"Jetstream connection lost: {str(e)}")
+            except RuntimeError:  # executor shut down by stop()
+                return
+            finally:
+                self._jetstream_connected.clear()
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, JETSTREAM_MAX_BACKOFF)
+
+    def _run_job(self, name: str, job) -> None:
+        try:
+            job()
+        except Exception as e:
+            logger.error(f"{name} job error: {str(e)}")
+
+    def _run_scheduler(self) -> None:
+        """Drive every periodic job from one thread instead of one sleeping thread per job."""
+        jobs = [
+            ("News posting", self.post_news_update, NEWS_POST_INTERVAL),
+            ("Periodic posting", self.periodic_posting, PERIODIC_POST_INTERVAL),
+            ("Notification", self._poll_notifications, NOTIFICATION_POLL_INTERVAL)
+        ]
+        next_run = {name: 0.0 for name, _, _ in jobs}
+        in_flight: Dict[str, Future] = {}
+
+        while self.running:
+            now = time.monotonic()
+            for name, job, interval in jobs:
+                if next_run[name] > now:
+                    continue
+                # Never overlap a job with its own previous run; check again an interval
+                # later rather than leaving the deadline in the past and spinning
+                if name in in_flight and not in_flight[name].done():
+                    next_run[name] = now + interval
+                    continue
+                # At most len(jobs) pool workers are held by jobs, leaving the rest for their fan-out
+                try:
+                    in_flight[name] = self._executor.submit(self._run_job, name, job)
+                except RuntimeError:  # executor shut down by stop()
+                    return
+                next_run[name] = now + interval
+            self._stop_event.wait(max(0.0, min(next_run.values()) - time.monotonic()))
+
+    def _spawn_worker(self, name: str, target) -> None:
+        """Run a worker thread that reports to the supervisor when it exits."""
+        def wrapper():
+            try:
+                target()
+            except Exception as e:
+                logger.error(f"{name} error: {str(e)}")
+            finally:
+                self._restart_queue.put(name)
+
+        thread = threading.Thread(target=wrapper, name=name, daemon=True)
+        self._workers[name] = thread
+        thread.start()
 
     def start(self):
         """Start the bot."""
         try:
-            self.authenticate()
-            
-            def run_post_worker():
-                while self.running:
-                    try:
-                        self.post_news_update()
-                        time.sleep(1800)  # 30 minutes between posts
-                    except Exception as e:
-                        logging.error(f"Post worker error: {str(e)}")
-                        time.sleep(60)
-
-            def run_periodic_posting():
-                while self.running:
-                    try:
-                        self.periodic_posting()
-                        time.sleep(1800)  # 30 minutes between posts
-                    except Exception as e:
-                        logging.error(f"Periodic posting error: {str(e)}")
-                        time.sleep(60)
-
-            def run_notification_worker():
-                while self.running:
-                    try:
-                        self.handle_notifications()
-                        time.sleep(60)  # Check notifications every 1 minute
-                    except Exception as e:
-                        logging.error(f"Notification worker error: {str(e)}")
-                        time.sleep(60)
-
-            # Initialize worker threads
-            post_thread = threading.Thread(target=run_post_worker, daemon=True)
-            periodic_thread = threading.Thread(target=run_periodic_posting, daemon=True)
-            notification_thread = threading.Thread(target=run_notification_worker, daemon=True)
-            
-            # Start workers
-            post_thread.start()
-            periodic_thread.start()
-            notification_thread.start()
+            self._ensure_session()
+
+            targets = {
+                "Scheduler": self._run_scheduler,
+                "Jetstream listener": self._run_jetstream
+            }
+            for name, target in targets.items():
+                self._spawn_worker(name, target)
             
             def signal_handler(signum, frame):
-                logging.info("Shutting down...")
-                self.running = False
+                logger.info("Shutting down...")
+                self.stop()
                 
-                # Wait for threads to finish
-                post_thread.join(timeout=5)
-                periodic_thread.join(timeout=5)
-                notification_thread.join(timeout=5)
+                # Wait for workers to finish
+                for thread in self._workers.values():
+                    thread.join(timeout=5)
                 
-                logging.info("Cleanup complete")
+                logger.info("Cleanup complete")
                 sys.exit(0)
 
             signal.signal(signal.SIGINT, signal_handler)
             signal.signal(signal.SIGTERM, signal_handler)
 
-            while True:
-                time.sleep(30)
-                # Monitor threads
-                if not post_thread.is_alive():
-                    logging.error("Post worker died, restarting...")
-                    post_thread = threading.Thread(target=run_post_worker, daemon=True)
-                    post_thread.start()
-                if not periodic_thread.is_alive():
-                    logging.error("Periodic posting worker died, restarting...")
-                    periodic_thread = threading.Thread(target=run_periodic_posting, daemon=True)
-                    periodic_thread.start()
-                if not notification_thread.is_alive():
-                    logging.error("Notification worker died, restarting...")
-                    notification_thread = threading.Thread(target=run_notification_worker, daemon=True)
-                    notification_thread.start()
+            # Block until a worker exits instead of polling their liveness
+            while self.running:
+                name = self._restart_queue.get()
+                if name is None or not self.running:
+                    break
+                logger.error(f"{name} died, restarting...")
+                self._stop_event.wait(1)  # avoid a hot loop if it keeps failing immediately
+                self._spawn_worker(name, targets[name])
 
         except Exception as e:
-            logging.error(f"Bot error: {str(e)}")
-            self.running = False
+            logger.error(f"Bot error: {str(e)}")
+            self.stop()
             sys.exit(1)
         finally:
             # Cleanup
-            logging.info("Shutting down bot...")
-            self.running = False
+            logger.info("Shutting down bot...")
+            self.stop()
             
-            if 'post_thread' in locals() and post_thread.is_alive():
-                post_thread.join(timeout=5)
-            if 'periodic_thread' in locals() and periodic_thread.is_alive():
-                periodic_thread.join(timeout=5)
-            if 'notification_thread' in locals() and notification_thread.is_alive():
-                notification_thread.join(timeout=5)
+            for thread in self._workers.values():
+                if thread.is_alive():
+                    thread.join(timeout=5)
             
-            logging.info("Bot shutdown complete")
+            logger.info("Bot shutdown complete")
 
 
 def main():
@@ -455,12 +1199,14 @@ def main():
         print("AI-powered news aggregation and interaction bot")
         print("Version: 1.1.0\n")
         
-        # Add your Bluesky handle and app password
-        handle = '' 
-        app_password = ''
+        # All credentials come from the environment
+        handle = require_env('BLUESKY_HANDLE')
+        app_password = require_env('BLUESKY_PASSWORD')
+        news_api_key = require_env('NEWS_API_KEY')
+        gemini_api_keys = gemini_keys_from_env()
         
         # Initialize and start the bot
-        bot = BskyAINewsBot(handle, app_password)
+        bot = BskyAINewsBot(handle, app_password, news_api_key, gemini_api_keys)
         
         print(f"Starting bot with handle: {handle}")
         print("Press Ctrl+C to stop the bot\n")
@@ -469,12 +1215,12 @@ def main():
     except KeyboardInterrupt:
         print("\nBot stopped by user")
     except Exception as e:
-        logging.error(f"Main function error: {str(e)}")
+        logger.error(f"Main function error: {str(e)}")
         sys.exit(1)
     finally:
         if bot:
-            bot.running = False
-            logging.info("Cleanup complete. Bot shutting down.")
+            bot.stop()
+            logger.info("Cleanup complete. Bot shutting down.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
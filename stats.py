@@ -1,10 +1,22 @@
 from atproto import Client
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from collections import Counter
 import os
+import re
+import time
 import colorama
 from colorama import Fore, Style
-import time
+
+try:
+    from ciso8601 import parse_datetime as parse_timestamp
+except ImportError:
+    def parse_timestamp(value):
+        """Parse an AT Proto timestamp into an aware UTC datetime"""
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+PROFILE_CACHE_TTL = 60  # seconds
+FEED_PAGE_SIZE = 100  # maximum allowed by app.bsky.feed.getAuthorFeed
+HASHTAG_RE = re.compile(r'(?:^|\s)(#\w+)')
 
 # Initialize colorama for Windows support
 colorama.init()
@@ -14,6 +26,7 @@ class SimpleBlueskyStats:
         self.client = Client()
         self.handle = handle
         self.password = password
+        self._profile_cache = {}  # handle -> (fetched_at, stats)
         self.login()
 
     def login(self):
@@ -26,42 +39,46 @@ class SimpleBlueskyStats:
             exit(1)
 
     def get_profile_stats(self):
-        """Get basic profile statistics"""
+        """Get basic profile statistics, reusing a lookup from the last minute"""
+        cached = self._profile_cache.get(self.handle)
+        if cached and time.monotonic() - cached[0] < PROFILE_CACHE_TTL:
+            return cached[1]
+
         try:
             profile = self.client.get_profile(self.handle)
-            return {
+            profile_stats = {
                 'followers': profile.followers_count,
                 'following': profile.follows_count,
                 'posts': profile.posts_count,
                 'display_name': profile.display_name
             }
+            self._profile_cache[self.handle] = (time.monotonic(), profile_stats)
+            return profile_stats
         except Exception as e:
             print(f"{Fore.RED}✗ Failed to get profile stats: {str(e)}{Style.RESET_ALL}")
             return None
 
     def get_recent_posts(self, hours=24):
-        """Get posts from the last specified hours"""
+        """Get (post, post_time) pairs from the last specified hours"""
         posts = []
         cursor = None
-        start_time = datetime.now() - timedelta(hours=hours)
+        start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
 
         try:
             while True:
-                feed = self.client.get_author_feed(self.handle, cursor=cursor)
+                feed = self.client.get_author_feed(actor=self.handle, limit=FEED_PAGE_SIZE, cursor=cursor)
                 
                 for post in feed.feed:
-                    post_time = datetime.strptime(post.post.indexed_at, "%Y-%m-%dT%H:%M:%S.%fZ")
+                    post_time = parse_timestamp(post.post.indexed_at)
                     if post_time < start_time:
                         return posts
-                    posts.append(post.post)
+                    posts.append((post.post, post_time))
 
+                # A short page means the feed is exhausted
                 cursor = feed.cursor
-                if not cursor or not feed.feed:
+                if not cursor or len(feed.feed) < FEED_PAGE_SIZE:
                     break
 
-                # Add a small delay to avoid rate limiting
-                time.sleep(0.5)
-
         except Exception as e:
             print(f"{Fore.RED}✗ Failed to get recent posts: {str(e)}{Style.RESET_ALL}")
             return posts
@@ -69,18 +86,18 @@ class SimpleBlueskyStats:
         return posts
 
     def analyze_posts(self, posts):
-        """Analyze posts for basic metrics"""
+        """Analyze (post, post_time) pairs for basic metrics in a single pass"""
         stats = {
             'total_posts': len(posts),
             'total_likes': 0,
             'total_reposts': 0,
-            'hashtags': defaultdict(int),
-            'post_times': defaultdict(int),
+            'hashtags': Counter(),
+            'post_times': Counter(),
             'avg_length': 0,
             'total_length': 0
         }
 
-        for post in posts:
+        for post, post_time in posts:
             # Count likes and reposts
             stats['total_likes'] += post.like_count
             stats['total_reposts'] += post.repost_count
@@ -91,13 +108,9 @@ class SimpleBlueskyStats:
                 stats['total_length'] += len(text)
                 
                 # Count hashtags
-                words = text.split()
-                for word in words:
-                    if word.startswith('#'):
-                        stats['hashtags'][word.lower()] += 1
+                stats['hashtags'].update(match.group(1).lower() for match in HASHTAG_RE.finditer(text))
 
-            # Track posting time
-            post_time = datetime.strptime(post.indexed_at, "%Y-%m-%dT%H:%M:%S.%fZ")
+            # Track posting time (already parsed by get_recent_posts)
             stats['post_times'][post_time.hour] += 1
 
         if stats['total_posts'] > 0:
@@ -133,8 +146,7 @@ class SimpleBlueskyStats:
         # Display top hashtags
         if stats['hashtags']:
             print(f"\n{Fore.YELLOW}Top Hashtags Used:{Style.RESET_ALL}")
-            sorted_hashtags = sorted(stats['hashtags'].items(), key=lambda x: x[1], reverse=True)[:5]
-            for tag, count in sorted_hashtags:
+            for tag, count in stats['hashtags'].most_common(5):
                 print(f"{tag}: {count} times")
 
         # Display posting time distribution
@@ -148,8 +160,8 @@ def main():
     print(f"{Fore.CYAN}Bluesky Stats Collector{Style.RESET_ALL}")
     
     # Get credentials from environment variables
-    handle = 'learninwithak.bsky.social'
-    password = 'Atharva5454'
+    handle = os.environ.get('BSKY_HANDLE')
+    password = os.environ.get('BSKY_PASSWORD')
 
     if not handle or not password:
         print(f"{Fore.RED}Error: Please set BSKY_HANDLE and BSKY_PASSWORD environment variables{Style.RESET_ALL}")